@@ -1,38 +1,108 @@
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
 
-load_dotenv()
+_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 
-# Konfigurasi Telegram Bot
-TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
-TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+@dataclass(frozen=True)
+class Settings:
+    """Konfigurasi bot yang sudah di-parse dari environment"""
+    # Konfigurasi Telegram Bot
+    telegram_token: Optional[str]
+    telegram_chat_id: Optional[str]
+    
+    # Konfigurasi OKX
+    okx_api_key: Optional[str]
+    okx_secret_key: Optional[str]
+    okx_passphrase: Optional[str]
+    okx_sandbox: bool
+    
+    # Konfigurasi Hyperliquid
+    hyperliquid_private_key: Optional[str]
+    hyperliquid_base_url: str
+    
+    # Konfigurasi Trading
+    trading_pairs: Tuple[str, ...]
+    initial_balance: float
+    max_position_size: float
+    stop_loss_percentage: float
+    take_profit_percentage: float
+    
+    # Konfigurasi Strategi
+    rsi_period: int
+    rsi_overbought: int
+    rsi_oversold: int
+    macd_fast: int
+    macd_slow: int
+    macd_signal: int
+    
+    # Konfigurasi Risk Management
+    max_daily_trades: int
+    max_daily_loss: float
+    cooldown_period: int  # detik
+    
+    # Konfigurasi Logging
+    log_to_console: bool
 
-# Konfigurasi OKX
-OKX_API_KEY = os.getenv('OKX_API_KEY')
-OKX_SECRET_KEY = os.getenv('OKX_SECRET_KEY')
-OKX_PASSPHRASE = os.getenv('OKX_PASSPHRASE')
-OKX_SANDBOX = os.getenv('OKX_SANDBOX', 'false').lower() == 'true'
+@lru_cache(maxsize=1)
+def load_settings() -> Settings:
+    """Parse environment sekali saat config pertama kali dibaca; panggilan berikutnya memakai objek yang sama"""
+    # Load .env di samping config.py hanya kalau ada; dotenv tidak perlu di-import tanpa file .env
+    if os.path.exists(_ENV_FILE):
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_FILE)
+        
+    return Settings(
+        telegram_token=os.getenv('TELEGRAM_TOKEN'),
+        telegram_chat_id=os.getenv('TELEGRAM_CHAT_ID'),
+        okx_api_key=os.getenv('OKX_API_KEY'),
+        okx_secret_key=os.getenv('OKX_SECRET_KEY'),
+        okx_passphrase=os.getenv('OKX_PASSPHRASE'),
+        okx_sandbox=os.getenv('OKX_SANDBOX', 'false').lower() == 'true',
+        hyperliquid_private_key=os.getenv('HYPERLIQUID_PRIVATE_KEY'),
+        hyperliquid_base_url="https://api.hyperliquid.xyz",
+        trading_pairs=('BTC/USDT', 'ETH/USDT', 'SOL/USDT'),
+        initial_balance=float(os.getenv('INITIAL_BALANCE', '1000')),
+        max_position_size=float(os.getenv('MAX_POSITION_SIZE', '0.1')),
+        stop_loss_percentage=float(os.getenv('STOP_LOSS_PERCENTAGE', '2.0')),
+        take_profit_percentage=float(os.getenv('TAKE_PROFIT_PERCENTAGE', '5.0')),
+        rsi_period=int(os.getenv('RSI_PERIOD', '14')),
+        rsi_overbought=int(os.getenv('RSI_OVERBOUGHT', '70')),
+        rsi_oversold=int(os.getenv('RSI_OVERSOLD', '30')),
+        macd_fast=int(os.getenv('MACD_FAST', '12')),
+        macd_slow=int(os.getenv('MACD_SLOW', '26')),
+        macd_signal=int(os.getenv('MACD_SIGNAL', '9')),
+        max_daily_trades=int(os.getenv('MAX_DAILY_TRADES', '10')),
+        max_daily_loss=float(os.getenv('MAX_DAILY_LOSS', '50')),
+        cooldown_period=int(os.getenv('COOLDOWN_PERIOD', '300')),  # 5 menit dalam detik
+        log_to_console=os.getenv('LOG_TO_CONSOLE', 'true').lower() == 'true'
+    )
 
-# Konfigurasi Hyperliquid
-HYPERLIQUID_PRIVATE_KEY = os.getenv('HYPERLIQUID_PRIVATE_KEY')
-HYPERLIQUID_BASE_URL = "https://api.hyperliquid.xyz"
+# Nama konstanta lama tetap tersedia (termasuk lewat `from config import *`),
+# nilainya diambil dari Settings saat pertama kali diakses
+__all__ = [
+    # Konfigurasi Telegram Bot
+    'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID',
+    # Konfigurasi OKX
+    'OKX_API_KEY', 'OKX_SECRET_KEY', 'OKX_PASSPHRASE', 'OKX_SANDBOX',
+    # Konfigurasi Hyperliquid
+    'HYPERLIQUID_PRIVATE_KEY', 'HYPERLIQUID_BASE_URL',
+    # Konfigurasi Trading
+    'TRADING_PAIRS', 'INITIAL_BALANCE', 'MAX_POSITION_SIZE',
+    'STOP_LOSS_PERCENTAGE', 'TAKE_PROFIT_PERCENTAGE',
+    # Konfigurasi Strategi
+    'RSI_PERIOD', 'RSI_OVERBOUGHT', 'RSI_OVERSOLD', 'MACD_FAST', 'MACD_SLOW', 'MACD_SIGNAL',
+    # Konfigurasi Risk Management
+    'MAX_DAILY_TRADES', 'MAX_DAILY_LOSS', 'COOLDOWN_PERIOD',
+    # Konfigurasi Logging
+    'LOG_TO_CONSOLE'
+]
 
-# Konfigurasi Trading
-TRADING_PAIRS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
-INITIAL_BALANCE = float(os.getenv('INITIAL_BALANCE', '1000'))
-MAX_POSITION_SIZE = float(os.getenv('MAX_POSITION_SIZE', '0.1'))
-STOP_LOSS_PERCENTAGE = float(os.getenv('STOP_LOSS_PERCENTAGE', '2.0'))
-TAKE_PROFIT_PERCENTAGE = float(os.getenv('TAKE_PROFIT_PERCENTAGE', '5.0'))
-
-# Konfigurasi Strategi
-RSI_PERIOD = int(os.getenv('RSI_PERIOD', '14'))
-RSI_OVERBOUGHT = int(os.getenv('RSI_OVERBOUGHT', '70'))
-RSI_OVERSOLD = int(os.getenv('RSI_OVERSOLD', '30'))
-MACD_FAST = int(os.getenv('MACD_FAST', '12'))
-MACD_SLOW = int(os.getenv('MACD_SLOW', '26'))
-MACD_SIGNAL = int(os.getenv('MACD_SIGNAL', '9'))
-
-# Konfigurasi Risk Management
-MAX_DAILY_TRADES = int(os.getenv('MAX_DAILY_TRADES', '10'))
-MAX_DAILY_LOSS = float(os.getenv('MAX_DAILY_LOSS', '50'))
-COOLDOWN_PERIOD = int(os.getenv('COOLDOWN_PERIOD', '300))  # 5 menit dalam detik
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve `config.settings` dan konstanta lama (mis. RSI_PERIOD) dari Settings"""
+    if name == 'settings':
+        return load_settings()
+    if name in __all__:
+        return getattr(load_settings(), name.lower())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
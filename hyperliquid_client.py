@@ -1,295 +1,397 @@
-import requests
-import json
+import asyncio
+import functools
+import aiohttp
+import orjson
 import logging
+import random
 import time
-from typing import Dict, List, Optional
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from config import HYPERLIQUID_PRIVATE_KEY, HYPERLIQUID_BASE_URL
 import hmac
-import hashlib
 import base64
 
+logger = logging.getLogger(__name__)
+
+def _http_safe(func):
+    """Tangkap error transport/JSON dari request Hyperliquid, log, lalu kembalikan None"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logger.error("Error saat %s: %s", func.__name__, e)
+            return None
+    return wrapper
+
+@dataclass
+class OrderBook:
+    """Orderbook dalam array numpy paralel (harga dan size per sisi)"""
+    bids_px: np.ndarray
+    bids_sz: np.ndarray
+    asks_px: np.ndarray
+    asks_sz: np.ndarray
+    
+    @property
+    def best_bid(self) -> Optional[float]:
+        return float(self.bids_px[0]) if self.bids_px.size else None
+        
+    @property
+    def best_ask(self) -> Optional[float]:
+        return float(self.asks_px[0]) if self.asks_px.size else None
+
+def _levels_to_arrays(levels: List) -> Tuple[np.ndarray, np.ndarray]:
+    """Ubah list [price, size, ...] menjadi array harga dan size float64"""
+    if len(levels) == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+        
+    levels = np.asarray(levels, dtype=np.float64)
+    if levels.ndim != 2 or levels.shape[1] < 2:
+        raise ValueError(f"level orderbook harus [price, size, ...], dapat shape {levels.shape}")
+    return levels[:, 0].copy(), levels[:, 1].copy()
+
+def _format_decimal(value: float, decimals: int) -> str:
+    """Format angka dengan presisi tetap tanpa notasi ilmiah (str(1e-05) -> "1e-05")"""
+    text = f"{value:.{decimals}f}"
+    # Buang nol di belakang koma saja, jangan nol dari bilangan bulat (100 -> "100")
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text
+
 class HyperliquidClient:
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
         self.base_url = HYPERLIQUID_BASE_URL
+        self._info_url = f"{HYPERLIQUID_BASE_URL}/info"
+        self._exchange_url = f"{HYPERLIQUID_BASE_URL}/exchange"
         self.private_key = HYPERLIQUID_PRIVATE_KEY
-        self.session = requests.Session()
-        self.session.headers.update({
+        self._key_bytes = self.private_key.encode('utf-8') if self.private_key else b''
+        # HMAC dengan key schedule (ipad/opad) yang sudah diproses, di-copy per signature
+        self._hmac_proto = hmac.new(self._key_bytes, digestmod='sha256') if self._key_bytes else None
+        self.headers = {
             'Content-Type': 'application/json',
             'User-Agent': 'TradingBot/1.0'
-        })
+        }
+        self._auth_prefix = 'Bearer '
+        self.timeout = aiohttp.ClientTimeout(total=10)
+        self.max_retries = 3
+        self.max_retry_delay = 10.0
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Cache markPrice per coin dari get_market_info
+        self.price_cache_ttl = 0.5
+        self._price_cache: Dict[str, float] = {}
+        self._price_cache_ts = 0.0
+        
+        # Jumlah desimal harga/size di payload order
+        self.order_decimals = 8
+        
+    async def connect(self) -> aiohttp.ClientSession:
+        """Membuka aiohttp session dengan connection pool keep-alive"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+            )
+        return self._session
+        
+    async def close(self):
+        """Menutup aiohttp session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    async def _request(self, method: str, url: str, data: Optional[bytes] = None,
+                       headers: Optional[Dict] = None) -> Tuple[int, bytes]:
+        """Kirim request dan kembalikan (status, body); query read-only di-retry saat 429/502/503/504"""
+        session = await self.connect()
+        # POST ke /exchange tidak pernah di-retry agar order tidak terkirim dua kali
+        retryable = method == 'GET' or url == self._info_url
+        attempt = 0
+        
+        while True:
+            async with session.request(method, url, data=data, headers=headers) as response:
+                content = await response.read()
+                
+            if not retryable or response.status not in (429, 502, 503, 504) or attempt >= self.max_retries:
+                return response.status, content
+                
+            await asyncio.sleep(self._retry_delay(response.headers.get('Retry-After'), attempt))
+            attempt += 1
+            
+    def _retry_delay(self, retry_after: Optional[str], attempt: int) -> float:
+        """Hormati header Retry-After, fallback ke exponential backoff dengan jitter"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_retry_delay)
+            except ValueError:
+                pass
+                
+        base = 0.1
+        return min(base * (2 ** attempt), self.max_retry_delay) + random.uniform(0, base)
+        
+    async def _post(self, url: str, payload: Dict, headers: Optional[Dict] = None) -> Tuple[int, bytes]:
+        """POST payload sebagai JSON yang di-encode dengan orjson"""
+        return await self._request('POST', url, data=orjson.dumps(payload), headers=headers)
         
-    def _generate_signature(self, data: str) -> str:
+    def _generate_signature(self, data: bytes) -> str:
         """Generate signature untuk autentikasi"""
         try:
-            if not self.private_key:
+            if not self._key_bytes:
                 raise ValueError("Private key tidak tersedia")
                 
-            # Convert private key to bytes
-            private_key_bytes = self.private_key.encode('utf-8')
-            
-            # Create HMAC signature
-            signature = hmac.new(
-                private_key_bytes,
-                data.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
+            # Copy prototype OpenSSL HMAC agar blok ipad tidak di-hash ulang
+            h = self._hmac_proto.copy()
+            h.update(data)
+            signature = h.hexdigest()
             
             return signature
             
         except Exception as e:
-            self.logger.error(f"Gagal generate signature: {e}")
+            logger.error("Gagal generate signature: %s", e)
             return ""
             
-    def get_market_info(self) -> Optional[Dict]:
+    @_http_safe
+    async def get_market_info(self) -> Optional[Dict]:
         """Mendapatkan informasi market dari Hyperliquid"""
-        try:
-            url = f"{self.base_url}/info"
-            response = self.session.get(url)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan market info: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan market info: {e}")
+        url = self._info_url
+        status, content = await self._request('GET', url)
+        
+        if status == 200:
+            return orjson.loads(content)
+        else:
+            logger.error("Gagal mendapatkan market info: %s", status)
             return None
             
-    def get_orderbook(self, coin: str) -> Optional[Dict]:
+    @_http_safe
+    async def get_orderbook(self, coin: str) -> Optional[OrderBook]:
         """Mendapatkan orderbook untuk coin tertentu"""
-        try:
-            url = f"{self.base_url}/info"
-            payload = {
-                "type": "orderBook",
-                "coin": coin
-            }
-            
-            response = self.session.post(url, json=payload)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan orderbook untuk {coin}: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan orderbook: {e}")
+        url = self._info_url
+        payload = {
+            "type": "orderBook",
+            "coin": coin
+        }
+        
+        status, content = await self._post(url, payload)
+        
+        if status != 200:
+            logger.error("Gagal mendapatkan orderbook untuk %s: %s", coin, status)
             return None
             
-    def get_user_state(self) -> Optional[Dict]:
-        """Mendapatkan state user dari Hyperliquid"""
+        data = orjson.loads(content)
         try:
-            if not self.private_key:
-                self.logger.warning("Private key tidak tersedia untuk user state")
-                return None
-                
-            url = f"{self.base_url}/info"
-            payload = {
-                "type": "clearinghouseState",
-                "user": self.private_key
-            }
+            bids_px, bids_sz = _levels_to_arrays(data['bids'])
+            asks_px, asks_sz = _levels_to_arrays(data['asks'])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Format orderbook %s tidak valid: %s", coin, e)
+            return None
             
-            response = self.session.post(url, json=payload)
+        return OrderBook(bids_px, bids_sz, asks_px, asks_sz)
+        
+    @_http_safe
+    async def get_user_state(self) -> Optional[Dict]:
+        """Mendapatkan state user dari Hyperliquid"""
+        if not self.private_key:
+            logger.warning("Private key tidak tersedia untuk user state")
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan user state: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan user state: {e}")
+        url = self._info_url
+        payload = {
+            "type": "clearinghouseState",
+            "user": self.private_key
+        }
+        
+        status, content = await self._post(url, payload)
+        
+        if status == 200:
+            return orjson.loads(content)
+        else:
+            logger.error("Gagal mendapatkan user state: %s", status)
             return None
             
-    def place_order(self, coin: str, side: str, size: float, 
-                   price: Optional[float] = None, order_type: str = "LIMIT") -> Optional[Dict]:
+    @_http_safe
+    async def place_order(self, coin: str, side: str, size: float, 
+                         price: Optional[float] = None, order_type: str = "LIMIT") -> Optional[Dict]:
         """Place order di Hyperliquid"""
-        try:
-            if not self.private_key:
-                self.logger.error("Private key tidak tersedia untuk trading")
-                return None
-                
-            url = f"{self.base_url}/exchange"
+        if not self.private_key:
+            logger.error("Private key tidak tersedia untuk trading")
+            return None
             
-            # Prepare order data
-            order_data = {
-                "type": "order",
-                "coin": coin,
-                "side": side.upper(),
-                "size": str(size),
-                "orderType": order_type.upper()
-            }
+        url = self._exchange_url
+        
+        order_type = order_type.upper()
+        
+        # Size yang terlalu kecil untuk presisi payload jadi "0", jangan sampai terkirim
+        size_text = _format_decimal(size, self.order_decimals)
+        if not float(size_text):
+            logger.error("Size order %s untuk %s terlalu kecil", size, coin)
+            return None
             
-            if price and order_type.upper() == "LIMIT":
-                order_data["price"] = str(price)
-                
-            # Generate signature
-            signature = self._generate_signature(json.dumps(order_data))
-            if not signature:
+        # Prepare order data
+        order_data = {
+            "type": "order",
+            "coin": coin,
+            "side": side.upper(),
+            "size": size_text,
+            "orderType": order_type
+        }
+        
+        if price and order_type == "LIMIT":
+            price_text = _format_decimal(price, self.order_decimals)
+            if not float(price_text):
+                logger.error("Harga order %s untuk %s terlalu kecil", price, coin)
                 return None
-                
-            # Add signature to headers
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {signature}'
-            }
+            order_data["price"] = price_text
             
-            response = self.session.post(url, json=order_data, headers=headers)
+        # Serialize sekali, bytes yang sama dipakai untuk signature dan request body
+        body = orjson.dumps(order_data)
+        signature = self._generate_signature(body)
+        if not signature:
+            return None
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"Order berhasil ditempatkan: {result}")
-                return result
-            else:
-                self.logger.error(f"Gagal place order: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat place order: {e}")
+        # Content-Type sudah ada di header session, cukup tambah Authorization
+        headers = {'Authorization': self._auth_prefix + signature}
+        
+        status, content = await self._request('POST', url, data=body, headers=headers)
+        
+        if status == 200:
+            result = orjson.loads(content)
+            logger.info("Order berhasil ditempatkan: %s", result)
+            return result
+        else:
+            logger.error("Gagal place order: %s - %s", status, content.decode(errors='replace'))
             return None
             
-    def cancel_order(self, coin: str, order_id: str) -> Optional[Dict]:
+    @_http_safe
+    async def cancel_order(self, coin: str, order_id: str) -> Optional[Dict]:
         """Cancel order di Hyperliquid"""
-        try:
-            if not self.private_key:
-                self.logger.error("Private key tidak tersedia untuk cancel order")
-                return None
-                
-            url = f"{self.base_url}/exchange"
-            
-            cancel_data = {
-                "type": "cancel",
-                "coin": coin,
-                "orderId": order_id
-            }
-            
-            # Generate signature
-            signature = self._generate_signature(json.dumps(cancel_data))
-            if not signature:
-                return None
-                
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {signature}'
-            }
+        if not self.private_key:
+            logger.error("Private key tidak tersedia untuk cancel order")
+            return None
             
-            response = self.session.post(url, json=cancel_data, headers=headers)
+        url = self._exchange_url
+        
+        cancel_data = {
+            "type": "cancel",
+            "coin": coin,
+            "orderId": order_id
+        }
+        
+        # Serialize sekali, bytes yang sama dipakai untuk signature dan request body
+        body = orjson.dumps(cancel_data)
+        signature = self._generate_signature(body)
+        if not signature:
+            return None
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"Order berhasil di-cancel: {result}")
-                return result
-            else:
-                self.logger.error(f"Gagal cancel order: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat cancel order: {e}")
+        headers = {'Authorization': self._auth_prefix + signature}
+        
+        status, content = await self._request('POST', url, data=body, headers=headers)
+        
+        if status == 200:
+            result = orjson.loads(content)
+            logger.info("Order berhasil di-cancel: %s", result)
+            return result
+        else:
+            logger.error("Gagal cancel order: %s - %s", status, content.decode(errors='replace'))
             return None
             
-    def get_open_orders(self) -> Optional[List[Dict]]:
+    @_http_safe
+    async def get_open_orders(self) -> Optional[List[Dict]]:
         """Mendapatkan daftar open orders"""
-        try:
-            if not self.private_key:
-                self.logger.warning("Private key tidak tersedia untuk open orders")
-                return None
-                
-            url = f"{self.base_url}/info"
-            payload = {
-                "type": "openOrders",
-                "user": self.private_key
-            }
-            
-            response = self.session.post(url, json=payload)
+        if not self.private_key:
+            logger.warning("Private key tidak tersedia untuk open orders")
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan open orders: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan open orders: {e}")
+        url = self._info_url
+        payload = {
+            "type": "openOrders",
+            "user": self.private_key
+        }
+        
+        status, content = await self._post(url, payload)
+        
+        if status == 200:
+            return orjson.loads(content)
+        else:
+            logger.error("Gagal mendapatkan open orders: %s", status)
             return None
             
-    def get_positions(self) -> Optional[List[Dict]]:
+    @_http_safe
+    async def get_positions(self) -> Optional[List[Dict]]:
         """Mendapatkan daftar posisi yang sedang dibuka"""
-        try:
-            if not self.private_key:
-                self.logger.warning("Private key tidak tersedia untuk positions")
-                return None
-                
-            url = f"{self.base_url}/info"
-            payload = {
-                "type": "userFills",
-                "user": self.private_key
-            }
-            
-            response = self.session.post(url, json=payload)
+        if not self.private_key:
+            logger.warning("Private key tidak tersedia untuk positions")
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan positions: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan positions: {e}")
+        url = self._info_url
+        payload = {
+            "type": "userFills",
+            "user": self.private_key
+        }
+        
+        status, content = await self._post(url, payload)
+        
+        if status == 200:
+            return orjson.loads(content)
+        else:
+            logger.error("Gagal mendapatkan positions: %s", status)
             return None
             
-    def get_trade_history(self, limit: int = 100) -> Optional[List[Dict]]:
+    @_http_safe
+    async def get_trade_history(self, limit: int = 100) -> Optional[List[Dict]]:
         """Mendapatkan history trading"""
-        try:
-            if not self.private_key:
-                self.logger.warning("Private key tidak tersedia untuk trade history")
-                return None
-                
-            url = f"{self.base_url}/info"
-            payload = {
-                "type": "userFills",
-                "user": self.private_key,
-                "limit": limit
-            }
-            
-            response = self.session.post(url, json=payload)
+        if not self.private_key:
+            logger.warning("Private key tidak tersedia untuk trade history")
+            return None
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.error(f"Gagal mendapatkan trade history: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan trade history: {e}")
+        url = self._info_url
+        payload = {
+            "type": "userFills",
+            "user": self.private_key,
+            "limit": limit
+        }
+        
+        status, content = await self._post(url, payload)
+        
+        if status == 200:
+            return orjson.loads(content)
+        else:
+            logger.error("Gagal mendapatkan trade history: %s", status)
             return None
             
-    def get_market_price(self, coin: str) -> Optional[float]:
+    def _parse_mark_prices(self, markets: List[Dict]) -> Dict[str, float]:
+        """Parse daftar market menjadi {name: markPrice}; entry yang tidak valid dilewati"""
+        mark_prices = {}
+        for market in markets:
+            try:
+                mark_prices[market['name']] = float(market['markPrice'])
+            except (KeyError, TypeError, ValueError):
+                continue
+                
+        return mark_prices
+        
+    async def get_market_price(self, coin: str) -> Optional[float]:
         """Mendapatkan harga market untuk coin tertentu"""
-        try:
-            ticker = self.get_market_info()
-            if ticker and 'data' in ticker:
-                for market in ticker['data']:
-                    if market.get('name') == coin:
-                        return float(market.get('markPrice', 0))
-            return None
+        # Pakai snapshot harga terakhir selama masih dalam TTL
+        if time.monotonic() - self._price_cache_ts < self.price_cache_ttl:
+            return self._price_cache.get(coin)
             
-        except Exception as e:
-            self.logger.error(f"Error saat mendapatkan market price: {e}")
+        ticker = await self.get_market_info()
+        if not ticker or 'data' not in ticker:
             return None
             
-    def test_connection(self) -> bool:
+        self._price_cache = self._parse_mark_prices(ticker['data'])
+        self._price_cache_ts = time.monotonic()
+        
+        return self._price_cache.get(coin)
+            
+    async def test_connection(self) -> bool:
         """Test koneksi ke Hyperliquid"""
-        try:
-            market_info = self.get_market_info()
-            if market_info:
-                self.logger.info("Koneksi Hyperliquid berhasil")
-                return True
-            else:
-                self.logger.error("Koneksi Hyperliquid gagal")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"Error saat test koneksi Hyperliquid: {e}")
+        market_info = await self.get_market_info()
+        if market_info:
+            logger.info("Koneksi Hyperliquid berhasil")
+            return True
+        else:
+            logger.error("Koneksi Hyperliquid gagal")
             return False
\ No newline at end of file
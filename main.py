@@ -5,24 +5,35 @@ Main entry point untuk Trading Bot
 
 import asyncio
 import logging
+import queue
 import signal
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from config import LOG_TO_CONSOLE
 from telegram_bot import TelegramTradingBot
 from trading_bot import TradingBot
 
+# uvloop opsional (Linux/macOS), fallback ke event loop bawaan asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
 class TradingBotRunner:
     def __init__(self):
-        self.logger = logging.getLogger(__name__)
         self.telegram_bot: Optional[TelegramTradingBot] = None
         self.trading_bot: Optional[TradingBot] = None
         self.is_running = False
+        self._stop_event = asyncio.Event()
         
     async def start(self):
         """Start semua bot"""
         try:
-            self.logger.info("🚀 Memulai Trading Bot System...")
+            logger.info("🚀 Memulai Trading Bot System...")
             
             # Start Telegram bot
             self.telegram_bot = TelegramTradingBot()
@@ -32,73 +43,98 @@ class TradingBotRunner:
             self.trading_bot = TradingBot()
             
             self.is_running = True
-            self.logger.info("✅ Trading Bot System berhasil dimulai!")
+            logger.info("✅ Trading Bot System berhasil dimulai!")
             
-            # Keep running
-            while self.is_running:
-                await asyncio.sleep(1)
+            # Tunggu sampai shutdown diminta
+            await self._stop_event.wait()
                 
         except KeyboardInterrupt:
-            self.logger.info("🛑 Received interrupt signal, shutting down...")
+            logger.info("🛑 Received interrupt signal, shutting down...")
         except Exception as e:
-            self.logger.error(f"❌ Error dalam main loop: {e}")
+            logger.error("❌ Error dalam main loop: %s", e)
         finally:
             await self.shutdown()
             
     async def shutdown(self):
         """Shutdown semua bot"""
         try:
-            self.logger.info("🛑 Mematikan Trading Bot System...")
+            logger.info("🛑 Mematikan Trading Bot System...")
             
             self.is_running = False
             
-            # Stop trading bot
-            if self.trading_bot and self.trading_bot.is_running:
-                await self.trading_bot.stop()
+            # Stop trading bot tanpa menutup posisi; cukup tutup koneksinya
+            if self.trading_bot:
+                self.trading_bot.is_running = False
+                await self.trading_bot.close()
                 
             # Stop Telegram bot
             if self.telegram_bot:
                 await self.telegram_bot.stop()
                 
-            self.logger.info("✅ Trading Bot System berhasil dimatikan!")
+            logger.info("✅ Trading Bot System berhasil dimatikan!")
             
         except Exception as e:
-            self.logger.error(f"❌ Error saat shutdown: {e}")
+            logger.error("❌ Error saat shutdown: %s", e)
             
-    def signal_handler(self, signum, frame):
+    def signal_handler(self, signum: int):
         """Handle system signals"""
-        self.logger.info(f"📡 Received signal {signum}, initiating shutdown...")
+        logger.info("📡 Received signal %s, initiating shutdown...", signum)
         self.is_running = False
+        self._stop_event.set()
+
+def setup_logging() -> QueueListener:
+    """Setup logging lewat queue; format dan I/O dikerjakan thread listener"""
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('trading_bot_system.log', delay=True)]
+    # Console handler bisa dimatikan di production lewat LOG_TO_CONSOLE=false
+    if LOG_TO_CONSOLE:
+        handlers.append(logging.StreamHandler())
+        
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        
+    # Tanpa basicConfig: formatter default-nya akan ikut di-bake ke record oleh QueueHandler
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
 
 async def main():
     """Main function"""
     # Setup logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('trading_bot_system.log'),
-            logging.StreamHandler()
-        ]
-    )
+    listener = setup_logging()
     
-    logger = logging.getLogger(__name__)
     logger.info("🎯 Starting Trading Bot System...")
     
     # Create and start runner
     runner = TradingBotRunner()
     
-    # Setup signal handlers
-    signal.signal(signal.SIGINT, runner.signal_handler)
-    signal.signal(signal.SIGTERM, runner.signal_handler)
+    # Setup signal handlers langsung di event loop
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, runner.signal_handler, signum)
+        except NotImplementedError:
+            # Windows tidak mendukung add_signal_handler
+            signal.signal(signum, lambda sig, frame: loop.call_soon_threadsafe(runner.signal_handler, sig))
     
     try:
         await runner.start()
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}")
+        logger.error("❌ Fatal error: %s", e)
         sys.exit(1)
+    finally:
+        # Flush sisa record di queue sebelum keluar
+        listener.stop()
 
 if __name__ == "__main__":
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,12 +1,28 @@
-import ccxt
+import asyncio
+import ccxt.async_support as ccxt
+import ccxt.pro as ccxtpro
 import logging
+import time
+import numpy as np
 from typing import Dict, List, Optional
 from config import OKX_API_KEY, OKX_SECRET_KEY, OKX_PASSPHRASE, OKX_SANDBOX
 
+def _book_side_to_array(levels: List) -> np.ndarray:
+    """Ubah level [price, amount, ...] dari ccxt menjadi array float64 (N, 2)"""
+    if not levels:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.asarray(levels, dtype=np.float64)[:, :2]
+
 class OKXClient:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.exchange = None
+        
+        # Snapshot daftar markets, di-reload dari OKX setelah TTL habis
+        self.markets_cache_ttl = 3600
+        self._markets_cache: Optional[List[str]] = None
+        self._markets_cache_ts = 0.0
+        
         self._initialize_exchange()
         
     def _initialize_exchange(self):
@@ -29,68 +45,79 @@ class OKXClient:
             self.logger.info("OKX client berhasil diinisialisasi")
             
         except Exception as e:
-            self.logger.error(f"Gagal menginisialisasi OKX client: {e}")
+            self.logger.error("Gagal menginisialisasi OKX client: %s", e)
             raise
             
-    def get_market_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[Dict]:
-        """Mendapatkan data market dari OKX"""
+    async def close(self):
+        """Menutup aiohttp session ccxt beserta pool koneksinya"""
+        if self.exchange:
+            await self.exchange.close()
+            
+    async def get_market_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> Optional[Dict[str, np.ndarray]]:
+        """Mendapatkan data market dari OKX sebagai kolom array numpy"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
             # Fetch OHLCV data
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
             
             if not ohlcv:
                 return None
                 
+            # Konversi sekali ke array float64: [[ts, o, h, l, c, v], ...] -> kolom per field
+            candles = np.asarray(ohlcv, dtype=np.float64)
+            
             # Convert to structured format
             data = {
-                'prices': [float(candle[4]) for candle in ohlcv],  # Close prices
-                'volumes': [float(candle[5]) for candle in ohlcv],  # Volumes
-                'highs': [float(candle[2]) for candle in ohlcv],   # High prices
-                'lows': [float(candle[3]) for candle in ohlcv],    # Low prices
-                'opens': [float(candle[1]) for candle in ohlcv],   # Open prices
-                'timestamps': [candle[0] for candle in ohlcv]      # Timestamps
+                'prices': candles[:, 4],                      # Close prices
+                'volumes': candles[:, 5],                     # Volumes
+                'highs': candles[:, 2],                       # High prices
+                'lows': candles[:, 3],                        # Low prices
+                'opens': candles[:, 1],                       # Open prices
+                'timestamps': candles[:, 0].astype(np.int64)  # Timestamps
             }
             
             return data
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan data market untuk {symbol}: {e}")
+            self.logger.error("Gagal mendapatkan data market untuk %s: %s", symbol, e)
             return None
             
-    def get_balance(self) -> Optional[Dict]:
+    async def get_balance(self) -> Optional[Dict]:
         """Mendapatkan balance dari OKX account"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
-            balance = self.exchange.fetch_balance()
+            balance = await self.exchange.fetch_balance()
+            
+            # Pakai map agregat ccxt {currency: amount}; key meta ('info', 'timestamp', ...) tidak ikut
+            totals = balance.get('total', {})
+            frees = balance.get('free', {})
+            useds = balance.get('used', {})
             
             # Filter hanya balance yang ada
-            available_balance = {}
-            for currency, info in balance.items():
-                if info['free'] > 0 or info['used'] > 0:
-                    available_balance[currency] = {
-                        'free': float(info['free']),
-                        'used': float(info['used']),
-                        'total': float(info['total'])
-                    }
-                    
-            return available_balance
+            return {
+                currency: {
+                    'free': float(frees.get(currency) or 0.0),
+                    'used': float(useds.get(currency) or 0.0),
+                    'total': float(total)
+                }
+                for currency, total in totals.items() if total
+            }
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan balance: {e}")
+            self.logger.error("Gagal mendapatkan balance: %s", e)
             return None
             
-    def get_ticker(self, symbol: str) -> Optional[Dict]:
+    async def get_ticker(self, symbol: str) -> Optional[Dict]:
         """Mendapatkan ticker information untuk symbol tertentu"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = await self.exchange.fetch_ticker(symbol)
             
             return {
                 'symbol': ticker['symbol'],
@@ -105,35 +132,35 @@ class OKXClient:
             }
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan ticker untuk {symbol}: {e}")
+            self.logger.error("Gagal mendapatkan ticker untuk %s: %s", symbol, e)
             return None
             
-    def get_order_book(self, symbol: str, limit: int = 20) -> Optional[Dict]:
-        """Mendapatkan order book untuk symbol tertentu"""
+    async def get_order_book(self, symbol: str, limit: int = 20) -> Optional[Dict]:
+        """Mendapatkan order book untuk symbol tertentu; bids/asks berupa array (N, 2) [price, amount]"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
-            order_book = self.exchange.fetch_order_book(symbol, limit)
+            order_book = await self.exchange.fetch_order_book(symbol, limit)
             
             return {
-                'bids': [[float(price), float(amount)] for price, amount in order_book['bids']],
-                'asks': [[float(price), float(amount)] for price, amount in order_book['asks']],
+                'bids': _book_side_to_array(order_book['bids']),
+                'asks': _book_side_to_array(order_book['asks']),
                 'timestamp': order_book['timestamp'],
                 'datetime': order_book['datetime']
             }
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan order book untuk {symbol}: {e}")
+            self.logger.error("Gagal mendapatkan order book untuk %s: %s", symbol, e)
             return None
             
-    def get_recent_trades(self, symbol: str, limit: int = 50) -> Optional[List[Dict]]:
+    async def get_recent_trades(self, symbol: str, limit: int = 50) -> Optional[List[Dict]]:
         """Mendapatkan recent trades untuk symbol tertentu"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
-            trades = self.exchange.fetch_trades(symbol, limit=limit)
+            trades = await self.exchange.fetch_trades(symbol, limit=limit)
             
             formatted_trades = []
             for trade in trades:
@@ -151,33 +178,104 @@ class OKXClient:
             return formatted_trades
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan recent trades untuk {symbol}: {e}")
+            self.logger.error("Gagal mendapatkan recent trades untuk %s: %s", symbol, e)
             return None
             
-    def get_markets(self) -> Optional[List[str]]:
+    async def get_markets(self) -> Optional[List[str]]:
         """Mendapatkan daftar semua available markets"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
-            markets = self.exchange.load_markets()
-            return list(markets.keys())
+            if self._markets_cache is not None and time.monotonic() - self._markets_cache_ts < self.markets_cache_ttl:
+                return self._markets_cache
+                
+            # load_markets tanpa reload selalu mengembalikan cache internal ccxt
+            markets = await self.exchange.load_markets(reload=self._markets_cache is not None)
+            self._markets_cache = list(markets.keys())
+            self._markets_cache_ts = time.monotonic()
+            
+            return self._markets_cache
             
         except Exception as e:
-            self.logger.error(f"Gagal mendapatkan markets: {e}")
+            self.logger.error("Gagal mendapatkan markets: %s", e)
             return None
             
-    def test_connection(self) -> bool:
+    def invalidate_markets(self):
+        """Paksa get_markets berikutnya me-reload markets dari OKX"""
+        self._markets_cache_ts = 0.0
+        
+    async def test_connection(self) -> bool:
         """Test koneksi ke OKX"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
                 
             # Try to fetch time
-            server_time = self.exchange.fetch_time()
-            self.logger.info(f"Koneksi OKX berhasil, server time: {server_time}")
+            server_time = await self.exchange.fetch_time()
+            self.logger.info("Koneksi OKX berhasil, server time: %s", server_time)
             return True
             
         except Exception as e:
-            self.logger.error(f"Koneksi OKX gagal: {e}")
-            return False
\ No newline at end of file
+            self.logger.error("Koneksi OKX gagal: %s", e)
+            return False
+
+class OKXStreamClient:
+    """Stream ticker OKX lewat websocket (ccxt.pro); harga terakhir dibaca dari memori"""
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = ccxtpro.okx({
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': 'spot'
+            }
+        })
+        
+        if OKX_SANDBOX:
+            self.exchange.set_sandbox_mode(True)
+            
+        # Ticker yang lebih tua dari ini dianggap basi (stream terputus)
+        self.max_ticker_age = 30.0
+        self.reconnect_delay = 5.0
+        self._ticker_cache: Dict[str, Dict] = {}
+        self._ticker_ts: Dict[str, float] = {}
+        self._tasks: List[asyncio.Task] = []
+        
+    def start(self, symbols: List[str]):
+        """Mulai satu task watch_ticker per symbol"""
+        for symbol in symbols:
+            self._tasks.append(asyncio.create_task(self._ticker_loop(symbol)))
+            
+    async def _ticker_loop(self, symbol: str):
+        """Terima update ticker untuk symbol sampai task di-cancel"""
+        while True:
+            try:
+                ticker = await self.exchange.watch_ticker(symbol)
+                self._ticker_cache[symbol] = ticker
+                self._ticker_ts[symbol] = time.monotonic()
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning("Stream ticker %s terputus: %s", symbol, e)
+                await asyncio.sleep(self.reconnect_delay)
+                
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        """Harga terakhir dari stream, atau None kalau belum ada / sudah basi"""
+        ticker = self._ticker_cache.get(symbol)
+        if not ticker or ticker.get('last') is None:
+            return None
+            
+        if time.monotonic() - self._ticker_ts[symbol] > self.max_ticker_age:
+            return None
+            
+        return float(ticker['last'])
+        
+    async def close(self):
+        """Hentikan semua stream dan tutup koneksi websocket"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        
+        await self.exchange.close()
\ No newline at end of file
@@ -4,7 +4,6 @@ Script sederhana untuk menjalankan Trading Bot
 """
 
 import asyncio
-import logging
 import sys
 import os
 from pathlib import Path
@@ -12,17 +11,21 @@ from pathlib import Path
 # Add current directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
+from main import setup_logging
 from telegram_bot import TelegramTradingBot
 
+# uvloop opsional (Linux/macOS), fallback ke event loop bawaan asyncio
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 async def main():
     """Main function untuk menjalankan bot"""
     print("🤖 Starting Trading Bot...")
     
-    # Setup basic logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s'
-    )
+    # Setup logging lewat queue, sama seperti main.py
+    listener = setup_logging()
     
     try:
         # Check if .env file exists
@@ -65,8 +68,14 @@ async def main():
                 print("✅ Bot berhasil dimatikan")
         except Exception as e:
             print(f"⚠️ Error saat mematikan bot: {e}")
+            
+        # Flush sisa record di queue sebelum keluar
+        listener.stop()
 
 if __name__ == "__main__":
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
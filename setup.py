@@ -3,11 +3,12 @@
 Setup script untuk Trading Bot
 """
 
+import importlib.metadata
+import importlib.util
 import os
 import sys
 import subprocess
 import shutil
-from pathlib import Path
 
 def print_banner():
     """Print banner setup"""
@@ -32,19 +33,60 @@ def check_python_version():
     print(f"✅ Python {sys.version_info.major}.{sys.version_info.minor} terdeteksi")
     return True
 
+def marker_applies(marker):
+    """Evaluasi environment marker requirement (mis. sys_platform != "win32")"""
+    try:
+        from packaging.markers import Marker
+    except ImportError:
+        # pip selalu membawa salinan packaging sendiri
+        from pip._vendor.packaging.markers import Marker
+    return Marker(marker).evaluate()
+
+def get_missing_requirements(path="requirements.txt"):
+    """Daftar requirement yang belum terpasang dengan versi yang di-pin"""
+    missing = []
+    with open(path) as f:
+        for line in f:
+            requirement = line.split('#', 1)[0].strip()
+            if not requirement:
+                continue
+                
+            # Requirement dengan marker yang tidak berlaku di platform ini tidak perlu diinstall
+            spec, _, marker = requirement.partition(';')
+            if marker.strip() and not marker_applies(marker.strip()):
+                continue
+                
+            name, pinned, version = spec.partition('==')
+            if pinned:
+                try:
+                    if importlib.metadata.version(name.strip()) == version.strip():
+                        continue
+                except importlib.metadata.PackageNotFoundError:
+                    pass
+                    
+            missing.append(requirement)
+            
+    return missing
+
 def install_dependencies():
     """Install dependencies"""
     print("\n📦 Installing dependencies...")
     
     try:
         # Check if pip is available
-        subprocess.run([sys.executable, "-m", "pip", "--version"], 
-                      check=True, capture_output=True)
-        
-        # Install requirements
-        print("   Installing from requirements.txt...")
+        if importlib.util.find_spec("pip") is None:
+            print("❌ pip tidak tersedia!")
+            return False
+            
+        # Hanya install requirement yang belum terpasang
+        missing = get_missing_requirements()
+        if not missing:
+            print("✅ Semua dependencies sudah terinstall!")
+            return True
+            
+        print(f"   Installing {len(missing)} package dari requirements.txt...")
         result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt"
+            sys.executable, "-m", "pip", "install", *missing
         ], capture_output=True, text=True)
         
         if result.returncode == 0:
@@ -55,9 +97,6 @@ def install_dependencies():
             print(result.stderr)
             return False
             
-    except subprocess.CalledProcessError:
-        print("❌ pip tidak tersedia!")
-        return False
     except Exception as e:
         print(f"❌ Error saat install dependencies: {e}")
         return False
@@ -66,14 +105,14 @@ def setup_environment():
     """Setup environment file"""
     print("\n🔧 Setting up environment...")
     
-    env_example = Path(".env.example")
-    env_file = Path(".env")
+    env_example = ".env.example"
+    env_file = ".env"
     
-    if not env_example.exists():
+    if not os.path.exists(env_example):
         print("❌ File .env.example tidak ditemukan!")
         return False
         
-    if env_file.exists():
+    if os.path.exists(env_file):
         print("⚠️ File .env sudah ada")
         overwrite = input("   Overwrite? (y/N): ").lower().strip()
         if overwrite != 'y':
@@ -81,8 +120,8 @@ def setup_environment():
             return True
             
     try:
-        # Copy .env.example to .env
-        shutil.copy(env_example, env_file)
+        # Copy .env.example to .env (isi saja, tanpa permission bits)
+        shutil.copyfile(env_example, env_file)
         print("✅ File .env berhasil dibuat")
         
         print("\n📝 **PENTING: Edit file .env dengan API keys yang sesuai!**")
@@ -99,16 +138,10 @@ def create_directories():
     print("\n📁 Creating directories...")
     
     try:
-        # Create logs directory
-        logs_dir = Path("logs")
-        logs_dir.mkdir(exist_ok=True)
-        print("✅ Directory logs berhasil dibuat")
-        
-        # Create data directory
-        data_dir = Path("data")
-        data_dir.mkdir(exist_ok=True)
-        print("✅ Directory data berhasil dibuat")
-        
+        for directory in ("logs", "data"):
+            os.makedirs(directory, exist_ok=True)
+            print(f"✅ Directory {directory} berhasil dibuat")
+            
         return True
         
     except Exception as e:
@@ -120,29 +153,29 @@ def test_installation():
     print("\n🧪 Testing installation...")
     
     try:
-        # Test imports
+        # Test imports di subprocess terpisah agar proses setup tidak ikut memuat semua modul bot
         print("   Testing imports...")
+        code = (
+            "import config\n"
+            "from trading_strategy import TradingStrategy\n"
+            "TradingStrategy()\n"
+            "import okx_client, hyperliquid_client\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True
+        )
         
-        # Test config
-        from config import *
-        print("   ✅ Config imported successfully")
-        
-        # Test strategy
-        from trading_strategy import TradingStrategy
-        strategy = TradingStrategy()
-        print("   ✅ Trading strategy imported successfully")
-        
-        # Test clients
-        from okx_client import OKXClient
-        from hyperliquid_client import HyperliquidClient
-        print("   ✅ Clients imported successfully")
-        
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            print(f"❌ Import error: {error[-1] if error else result.returncode}")
+            return False
+            
+        print("   ✅ Config, trading strategy, dan clients imported successfully")
         print("✅ Semua imports berhasil!")
         return True
         
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        return False
     except Exception as e:
         print(f"❌ Error saat testing: {e}")
         return False
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from itertools import islice
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 from typing import Dict, List
@@ -40,11 +41,19 @@ class TelegramTradingBot:
             self.logger.info("✅ Telegram bot berhasil dimulai!")
             
         except Exception as e:
-            self.logger.error(f"❌ Gagal start Telegram bot: {e}")
+            self.logger.error("❌ Gagal start Telegram bot: %s", e)
             raise
             
     async def stop(self):
         """Stop Telegram bot"""
+        try:
+            # Shutdown proses tidak menutup posisi (itu hanya lewat /stop_bot); cukup hentikan loop dan tutup koneksi
+            self.trading_bot.is_running = False
+            await self.trading_bot.close()
+            
+        except Exception as e:
+            self.logger.error("❌ Error saat menutup koneksi bot trading: %s", e)
+            
         try:
             if self.application:
                 await self.application.updater.stop()
@@ -54,7 +63,7 @@ class TelegramTradingBot:
             self.logger.info("✅ Telegram bot berhasil dihentikan!")
             
         except Exception as e:
-            self.logger.error(f"❌ Error saat stop Telegram bot: {e}")
+            self.logger.error("❌ Error saat stop Telegram bot: %s", e)
             
     async def _start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
@@ -255,9 +264,8 @@ Saya adalah bot trading otomatis yang menggunakan strategi canggih untuk trading
             else:
                 trades_message = "📊 **History Trading**\n\n"
                 
-                # Show last 10 trades
-                recent_trades = trades[-10:]
-                for trade in reversed(recent_trades):
+                # Show last 10 trades (deque tidak bisa di-slice)
+                for trade in islice(reversed(trades), 10):
                     trades_message += f"• **{trade['pair']}** - {trade['side']}\n"
                     trades_message += f"  └ Size: {trade['size']:.4f}\n"
                     trades_message += f"  └ Price: ${trade['price']:.2f}\n"
@@ -364,7 +372,7 @@ Saya adalah bot trading otomatis yang menggunakan strategi canggih untuk trading
                     parse_mode='Markdown'
                 )
         except Exception as e:
-            self.logger.error(f"❌ Error send notification: {e}")
+            self.logger.error("❌ Error send notification: %s", e)
             
     async def send_trade_notification(self, trade_info: Dict):
         """Send trade notification"""
@@ -383,7 +391,7 @@ Saya adalah bot trading otomatis yang menggunakan strategi canggih untuk trading
             await self.send_notification(message)
             
         except Exception as e:
-            self.logger.error(f"❌ Error send trade notification: {e}")
+            self.logger.error("❌ Error send trade notification: %s", e)
             
     async def send_error_notification(self, error_message: str):
         """Send error notification"""
@@ -400,7 +408,7 @@ Bot akan mencoba recovery otomatis.
             await self.send_notification(message)
             
         except Exception as e:
-            self.logger.error(f"❌ Error send error notification: {e}")
+            self.logger.error("❌ Error send error notification: %s", e)
 
 # Import datetime untuk error notification
 from datetime import datetime
\ No newline at end of file
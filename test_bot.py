@@ -123,7 +123,7 @@ class BotTester:
             print("🏦 Testing OKX Client...")
             
             # Test connection
-            if not self.okx_client.test_connection():
+            if not await self.okx_client.test_connection():
                 print("  ❌ Koneksi OKX gagal")
                 return False
                 
@@ -132,7 +132,7 @@ class BotTester:
             # Test market data (if API keys available)
             if OKX_API_KEY and OKX_API_KEY != "your_okx_api_key_here":
                 try:
-                    market_data = self.okx_client.get_market_data("BTC/USDT", "1h", 10)
+                    market_data = await self.okx_client.get_market_data("BTC/USDT", "1h", 10)
                     if market_data:
                         print(f"  ✅ Market data berhasil: {len(market_data['prices'])} data points")
                     else:
@@ -148,20 +148,23 @@ class BotTester:
             print(f"  ❌ Error testing OKX client: {e}")
             return False
             
+        finally:
+            await self.okx_client.close()
+            
     async def test_hyperliquid_client(self):
         """Test Hyperliquid client"""
         try:
             print("🔗 Testing Hyperliquid Client...")
             
             # Test connection
-            if not self.hyperliquid_client.test_connection():
+            if not await self.hyperliquid_client.test_connection():
                 print("  ❌ Koneksi Hyperliquid gagal")
                 return False
                 
             print("  ✅ Koneksi Hyperliquid berhasil")
             
             # Test market info
-            market_info = self.hyperliquid_client.get_market_info()
+            market_info = await self.hyperliquid_client.get_market_info()
             if market_info:
                 print(f"  ✅ Market info berhasil")
             else:
@@ -173,6 +176,9 @@ class BotTester:
             print(f"  ❌ Error testing Hyperliquid client: {e}")
             return False
             
+        finally:
+            await self.hyperliquid_client.close()
+            
     def test_integration(self):
         """Test integrasi antar komponen"""
         try:
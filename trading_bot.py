@@ -1,13 +1,14 @@
 import asyncio
 import logging
 import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pandas as pd
 
 from config import *
 from trading_strategy import TradingStrategy
-from okx_client import OKXClient
+from okx_client import OKXClient, OKXStreamClient
 from hyperliquid_client import HyperliquidClient
 
 class TradingBot:
@@ -15,15 +16,19 @@ class TradingBot:
         self.logger = self._setup_logging()
         self.strategy = TradingStrategy()
         self.okx_client = OKXClient()
+        self.okx_stream = OKXStreamClient()
         self.hyperliquid_client = HyperliquidClient()
         
         # Trading state
         self.is_running = False
         self.daily_trades = 0
+        self.total_trades = 0
         self.daily_pnl = 0.0
+        self._daily_loss_limit = -MAX_DAILY_LOSS
         self.last_trade_time = None
         self.active_positions = {}
-        self.trade_history = []
+        # Hanya simpan 1000 trade terakhir; trade lama otomatis terbuang
+        self.trade_history = deque(maxlen=1000)
         
         # Market data cache
         self.market_data_cache = {}
@@ -46,13 +51,16 @@ class TradingBot:
         self.logger.info("🚀 Memulai Trading Bot...")
         
         # Test koneksi
-        if not self._test_connections():
+        if not await self._test_connections():
             self.logger.error("❌ Koneksi gagal, bot tidak bisa dimulai")
             return False
             
         self.is_running = True
         self.logger.info("✅ Bot trading berhasil dimulai!")
         
+        # Stream harga real-time untuk eksekusi order
+        self.okx_stream.start(TRADING_PAIRS)
+        
         # Reset daily counters
         self._reset_daily_counters()
         
@@ -67,19 +75,27 @@ class TradingBot:
         # Close all positions
         await self._close_all_positions()
         
+        await self.close()
+        
         self.logger.info("✅ Bot trading berhasil dihentikan")
         
-    def _test_connections(self) -> bool:
+    async def close(self):
+        """Tutup stream dan HTTP session OKX dan Hyperliquid"""
+        await self.okx_stream.close()
+        await self.okx_client.close()
+        await self.hyperliquid_client.close()
+        
+    async def _test_connections(self) -> bool:
         """Test koneksi ke semua exchange"""
         try:
             # Test OKX
-            okx_ok = self.okx_client.test_connection()
+            okx_ok = await self.okx_client.test_connection()
             if not okx_ok:
                 self.logger.error("❌ Koneksi OKX gagal")
                 return False
                 
             # Test Hyperliquid
-            hyperliquid_ok = self.hyperliquid_client.test_connection()
+            hyperliquid_ok = await self.hyperliquid_client.test_connection()
             if not hyperliquid_ok:
                 self.logger.error("❌ Koneksi Hyperliquid gagal")
                 return False
@@ -88,7 +104,7 @@ class TradingBot:
             return True
             
         except Exception as e:
-            self.logger.error(f"❌ Error saat test koneksi: {e}")
+            self.logger.error("❌ Error saat test koneksi: %s", e)
             return False
             
     def _reset_daily_counters(self):
@@ -127,40 +143,40 @@ class TradingBot:
                 await asyncio.sleep(COOLDOWN_PERIOD)
                 
             except Exception as e:
-                self.logger.error(f"❌ Error dalam main loop: {e}")
+                self.logger.error("❌ Error dalam main loop: %s", e)
                 await asyncio.sleep(60)  # Wait 1 menit sebelum retry
                 
     def _check_daily_limits(self) -> bool:
         """Check apakah daily limits sudah tercapai"""
+        # Reset dulu kalau sudah ganti hari, supaya limit kemarin tidak terus memblokir
+        if self.last_trade_time and datetime.now().date() > self.last_trade_time.date():
+            self._reset_daily_counters()
+            return False
+            
         # Check daily trades
         if self.daily_trades >= MAX_DAILY_TRADES:
             return True
             
         # Check daily loss
-        if self.daily_pnl <= -MAX_DAILY_LOSS:
-            return True
-            
-        # Check if it's a new day
-        now = datetime.now()
-        if self.last_trade_time and now.date() > self.last_trade_time.date():
-            self._reset_daily_counters()
-            
-        return False
+        return self.daily_pnl <= self._daily_loss_limit
         
     async def _update_market_data(self):
         """Update market data untuk semua trading pairs"""
-        for pair in TRADING_PAIRS:
-            try:
-                # Get data from OKX
-                okx_data = self.okx_client.get_market_data(pair, '1h', 100)
+        # Fetch semua pair secara concurrent lewat client OKX async
+        results = await asyncio.gather(
+            *(self.okx_client.get_market_data(pair, '1h', 100) for pair in TRADING_PAIRS),
+            return_exceptions=True
+        )
+        
+        for pair, okx_data in zip(TRADING_PAIRS, results):
+            if isinstance(okx_data, Exception):
+                self.logger.error("❌ Error update market data untuk %s: %s", pair, okx_data)
+                continue
                 
-                if okx_data:
-                    self.market_data_cache[pair] = okx_data
-                    self.last_update_time[pair] = datetime.now()
-                    self.logger.debug(f"✅ Market data updated untuk {pair}")
-                    
-            except Exception as e:
-                self.logger.error(f"❌ Error update market data untuk {pair}: {e}")
+            if okx_data:
+                self.market_data_cache[pair] = okx_data
+                self.last_update_time[pair] = datetime.now()
+                self.logger.debug("✅ Market data updated untuk %s", pair)
                 
     def _generate_signals(self) -> Dict:
         """Generate trading signals berdasarkan market data"""
@@ -186,7 +202,7 @@ class TradingBot:
             return signals
             
         except Exception as e:
-            self.logger.error(f"❌ Error generate signals: {e}")
+            self.logger.error("❌ Error generate signals: %s", e)
             return {}
             
     async def _execute_trading_signals(self, signals: Dict):
@@ -201,7 +217,7 @@ class TradingBot:
                     
                 # Check cooldown
                 if self._is_in_cooldown():
-                    self.logger.info(f"⏰ Cooldown aktif, skip trading untuk {pair}")
+                    self.logger.info("⏰ Cooldown aktif, skip trading untuk %s", pair)
                     continue
                     
                 # Execute trade
@@ -211,7 +227,7 @@ class TradingBot:
                     await self._execute_sell_order(pair, signal_data)
                     
             except Exception as e:
-                self.logger.error(f"❌ Error execute signal untuk {pair}: {e}")
+                self.logger.error("❌ Error execute signal untuk %s: %s", pair, e)
                 
     def _is_in_cooldown(self) -> bool:
         """Check apakah bot sedang dalam cooldown"""
@@ -236,12 +252,12 @@ class TradingBot:
             )
             
             if position_size <= 0:
-                self.logger.warning(f"⚠️ Position size terlalu kecil untuk {pair}")
+                self.logger.warning("⚠️ Position size terlalu kecil untuk %s", pair)
                 return
                 
             # Place order di Hyperliquid
             coin = pair.split('/')[0]  # Extract coin name
-            order_result = self.hyperliquid_client.place_order(
+            order_result = await self.hyperliquid_client.place_order(
                 coin=coin,
                 side="BUY",
                 size=position_size,
@@ -251,19 +267,19 @@ class TradingBot:
             
             if order_result:
                 self._record_trade(pair, "BUY", position_size, current_price, signal_data)
-                self.logger.info(f"✅ Buy order berhasil untuk {pair}: {position_size} @ {current_price}")
+                self.logger.info("✅ Buy order berhasil untuk %s: %s @ %s", pair, position_size, current_price)
             else:
-                self.logger.error(f"❌ Buy order gagal untuk {pair}")
+                self.logger.error("❌ Buy order gagal untuk %s", pair)
                 
         except Exception as e:
-            self.logger.error(f"❌ Error execute buy order untuk {pair}: {e}")
+            self.logger.error("❌ Error execute buy order untuk %s: %s", pair, e)
             
     async def _execute_sell_order(self, pair: str, signal_data: Dict):
         """Execute sell order"""
         try:
             # Check if we have position to sell
             if pair not in self.active_positions or self.active_positions[pair] <= 0:
-                self.logger.info(f"ℹ️ Tidak ada posisi untuk dijual di {pair}")
+                self.logger.info("ℹ️ Tidak ada posisi untuk dijual di %s", pair)
                 return
                 
             # Get current price
@@ -275,7 +291,7 @@ class TradingBot:
             position_size = self.active_positions[pair]
             coin = pair.split('/')[0]
             
-            order_result = self.hyperliquid_client.place_order(
+            order_result = await self.hyperliquid_client.place_order(
                 coin=coin,
                 side="SELL",
                 size=position_size,
@@ -285,27 +301,33 @@ class TradingBot:
             
             if order_result:
                 self._record_trade(pair, "SELL", position_size, current_price, signal_data)
-                self.logger.info(f"✅ Sell order berhasil untuk {pair}: {position_size} @ {current_price}")
+                self.logger.info("✅ Sell order berhasil untuk %s: %s @ %s", pair, position_size, current_price)
             else:
-                self.logger.error(f"❌ Sell order gagal untuk {pair}")
+                self.logger.error("❌ Sell order gagal untuk %s", pair)
                 
         except Exception as e:
-            self.logger.error(f"❌ Error execute sell order untuk {pair}: {e}")
+            self.logger.error("❌ Error execute sell order untuk %s: %s", pair, e)
             
     def _get_current_price(self, pair: str) -> Optional[float]:
         """Get current price untuk pair tertentu"""
         try:
-            if pair in self.market_data_cache and self.market_data_cache[pair]['prices']:
-                return self.market_data_cache[pair]['prices'][-1]
+            # Utamakan harga dari stream ticker, fallback ke close candle terakhir
+            stream_price = self.okx_stream.get_last_price(pair)
+            if stream_price is not None:
+                return stream_price
+                
+            # prices berupa array numpy, cek panjangnya (bukan truthiness)
+            if pair in self.market_data_cache and len(self.market_data_cache[pair]['prices']):
+                return float(self.market_data_cache[pair]['prices'][-1])
             return None
         except Exception as e:
-            self.logger.error(f"❌ Error get current price untuk {pair}: {e}")
+            self.logger.error("❌ Error get current price untuk %s: %s", pair, e)
             return None
             
     async def _get_available_balance(self) -> float:
         """Get available balance dari Hyperliquid"""
         try:
-            user_state = self.hyperliquid_client.get_user_state()
+            user_state = await self.hyperliquid_client.get_user_state()
             if user_state and 'data' in user_state:
                 # Extract USDC balance
                 for asset in user_state['data'].get('assetPositions', []):
@@ -313,7 +335,7 @@ class TradingBot:
                         return float(asset.get('free', 0))
             return INITIAL_BALANCE
         except Exception as e:
-            self.logger.error(f"❌ Error get balance: {e}")
+            self.logger.error("❌ Error get balance: %s", e)
             return INITIAL_BALANCE
             
     def _record_trade(self, pair: str, side: str, size: float, price: float, signal_data: Dict):
@@ -330,6 +352,7 @@ class TradingBot:
         
         self.trade_history.append(trade)
         self.daily_trades += 1
+        self.total_trades += 1
         self.last_trade_time = datetime.now()
         
         # Update active positions
@@ -341,7 +364,7 @@ class TradingBot:
     async def _update_positions(self):
         """Update status posisi yang sedang dibuka"""
         try:
-            positions = self.hyperliquid_client.get_positions()
+            positions = await self.hyperliquid_client.get_positions()
             if positions:
                 # Update active positions
                 for position in positions:
@@ -353,7 +376,7 @@ class TradingBot:
                         self.active_positions[pair] = size
                         
         except Exception as e:
-            self.logger.error(f"❌ Error update positions: {e}")
+            self.logger.error("❌ Error update positions: %s", e)
             
     async def _risk_management(self):
         """Risk management untuk semua posisi"""
@@ -375,7 +398,7 @@ class TradingBot:
                     await self._execute_take_profit(pair, current_price)
                     
             except Exception as e:
-                self.logger.error(f"❌ Error risk management untuk {pair}: {e}")
+                self.logger.error("❌ Error risk management untuk %s: %s", pair, e)
                 
     def _should_stop_loss(self, pair: str, current_price: float) -> bool:
         """Check apakah harus execute stop loss"""
@@ -395,7 +418,7 @@ class TradingBot:
             coin = pair.split('/')[0]
             position_size = self.active_positions[pair]
             
-            order_result = self.hyperliquid_client.place_order(
+            order_result = await self.hyperliquid_client.place_order(
                 coin=coin,
                 side="SELL",
                 size=position_size,
@@ -404,11 +427,11 @@ class TradingBot:
             )
             
             if order_result:
-                self.logger.info(f"🛑 Stop loss executed untuk {pair}")
+                self.logger.info("🛑 Stop loss executed untuk %s", pair)
                 self.active_positions[pair] = 0
                 
         except Exception as e:
-            self.logger.error(f"❌ Error execute stop loss untuk {pair}: {e}")
+            self.logger.error("❌ Error execute stop loss untuk %s: %s", pair, e)
             
     async def _execute_take_profit(self, pair: str, current_price: float):
         """Execute take profit"""
@@ -416,7 +439,7 @@ class TradingBot:
             coin = pair.split('/')[0]
             position_size = self.active_positions[pair]
             
-            order_result = self.hyperliquid_client.place_order(
+            order_result = await self.hyperliquid_client.place_order(
                 coin=coin,
                 side="SELL",
                 size=position_size,
@@ -425,11 +448,11 @@ class TradingBot:
             )
             
             if order_result:
-                self.logger.info(f"💰 Take profit executed untuk {pair}")
+                self.logger.info("💰 Take profit executed untuk %s", pair)
                 self.active_positions[pair] = 0
                 
         except Exception as e:
-            self.logger.error(f"❌ Error execute take profit untuk {pair}: {e}")
+            self.logger.error("❌ Error execute take profit untuk %s: %s", pair, e)
             
     async def _close_all_positions(self):
         """Close semua posisi yang sedang dibuka"""
@@ -444,7 +467,7 @@ class TradingBot:
                             'sentiment': {'sentiment': -1.0}
                         })
                 except Exception as e:
-                    self.logger.error(f"❌ Error close position untuk {pair}: {e}")
+                    self.logger.error("❌ Error close position untuk %s: %s", pair, e)
                     
     def get_status(self) -> Dict:
         """Get status bot trading"""
@@ -454,5 +477,5 @@ class TradingBot:
             'daily_pnl': self.daily_pnl,
             'active_positions': self.active_positions,
             'last_trade_time': self.last_trade_time,
-            'total_trades': len(self.trade_history)
+            'total_trades': self.total_trades
         }
\ No newline at end of file
@@ -86,7 +86,7 @@ class TradingStrategy:
         
         # Volume Analysis (if available)
         volume_signal = 0.0
-        if volumes and len(volumes) >= 20:
+        if volumes is not None and len(volumes) >= 20:
             avg_volume = np.mean(volumes[-20:])
             current_volume = volumes[-1]
             volume_signal = 1.0 if current_volume > avg_volume * 1.5 else -1.0 if current_volume < avg_volume * 0.5 else 0.0